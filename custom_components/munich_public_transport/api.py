@@ -1,11 +1,17 @@
-from urllib.parse import urlencode
-
 import aiohttp
 import asyncio
+import functools
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Awaitable, Callable, Final, Hashable, Optional, Tuple
 import logging
 
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
 _LOGGER = logging.getLogger(__name__)
 
 class MunichTransportAPIError(Exception):
@@ -18,31 +24,203 @@ class APIError(MunichTransportAPIError):
     """Raised when the API returns an error or unexpected response."""
 
 
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+_UTC = timezone.utc
+
+_ICONS: Final[Dict[str, str]] = {
+    "UBAHN": "mdi:subway-variant",
+    "TRAM": "mdi:tram",
+    "SBAHN": "mdi:train",
+    "BUS": "mdi:bus",
+    "REGIONAL_BUS": "mdi:bus-clock",
+    "RUFTAXI": "mdi:taxi",
+}
+
+
+def _ms_to_s(timestamp: int) -> int:
+    """Convert an API timestamp in milliseconds to whole epoch seconds."""
+    return timestamp // 1000
+
+
+def _ms_to_iso(timestamp: int | None) -> str | None:
+    """Convert an API timestamp in milliseconds to a UTC ISO 8601 string."""
+    return datetime.fromtimestamp(timestamp // 1000, _UTC).isoformat() if timestamp else None
+
+
+@dataclass(slots=True, frozen=True)
+class Departure:
+    """A single departure from a station."""
+
+    line: str
+    destination: str
+    realtime_departure: int
+    planned_departure: int
+    type: str
+    cancelled: bool
+    messages: Tuple[Dict[str, Any], ...] = field(hash=False)
+    platform: int | None
+    platform_changed: bool
+    stop_position_number: int | None
+    delay: int
+    icon: str
+    occupancy: str
+    network: str
+
+
+def _make_departure(dep: Dict[str, Any]) -> Departure:
+    """Transform a raw API departure with at least one departure time into a Departure."""
+    get = dep.get
+    transport_type = dep["transportType"]
+    planned = get("plannedDepartureTime")
+    realtime = get("realtimeDepartureTime")
+    if realtime is None:
+        realtime = planned
+    elif planned is None:
+        planned = realtime
+    return Departure(
+        line=dep["label"],
+        destination=dep["destination"],
+        realtime_departure=_ms_to_s(realtime),
+        planned_departure=_ms_to_s(planned),
+        type=transport_type,
+        cancelled=get("cancelled", False),
+        messages=tuple(get("messages") or ()),
+        platform=get("platform"),
+        platform_changed=get("platformChanged", False),
+        stop_position_number=get("stopPositionNumber"),
+        delay=get("delayInMinutes", 0),
+        icon=_ICONS.get(transport_type, "mdi:train-car"),
+        occupancy=get("occupancy", "UNKNOWN"),
+        network=get("network", ""),
+    )
+
+
+def _parse_departures(data: List[Dict[str, Any]]) -> List[Departure]:
+    """Transform raw API departures, skipping those without any departure time."""
+    return [
+        _make_departure(dep) for dep in data
+        if dep.get("realtimeDepartureTime") is not None or dep.get("plannedDepartureTime") is not None
+    ]
+
+
+_INFLIGHT: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+
+def _release_inflight(key: Hashable, task: "asyncio.Future[Any]") -> None:
+    """Forget a finished in-flight request."""
+    if _INFLIGHT.get(key) is task:
+        del _INFLIGHT[key]
+    if not task.cancelled():
+        # Mark the exception as retrieved in case every waiter went away
+        task.exception()
+
+
+class _AsyncTTLCache:
+    """Cache the results of an async API method for a fixed time."""
+
+    def __init__(self, ttl: float) -> None:
+        """Initialize the cache with a time to live in seconds."""
+        self._ttl = ttl
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+
+    def _get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return whether a fresh entry exists for the key, and its value."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return True, entry[1]
+        return False, None
+
+    def _prune(self, now: float) -> None:
+        """Drop expired entries, and the locks of their keys unless still in use."""
+        for key in [key for key, (expires, _) in self._entries.items() if expires <= now]:
+            del self._entries[key]
+            lock = self._locks.get(key)
+            if lock is not None and not lock.locked():
+                del self._locks[key]
+
+    def __call__(self, func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        """Wrap an API method so calls within the TTL share one result."""
+        @functools.wraps(func)
+        async def wrapper(api: "MunichTransportAPI", *args: Any, **kwargs: Any) -> Any:
+            key = (args, tuple(sorted(kwargs.items())))
+            hit, value = self._get(key)
+            if hit:
+                return value
+            # Concurrent misses for the same key wait for a single fetch
+            async with self._locks.setdefault(key, asyncio.Lock()):
+                hit, value = self._get(key)
+                if hit:
+                    return value
+                value = await func(api, *args, **kwargs)
+                now = time.monotonic()
+                self._prune(now)
+                self._entries[key] = (now + self._ttl, value)
+                return value
+
+        return wrapper
+
+
 class MunichTransportAPI:
     BASE_URL = "https://www.mvg.de/api/bgw-pt/v3"
 
-    @staticmethod
-    async def _make_request(url: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Make a request to the API."""
+    def __init__(self, session: aiohttp.ClientSession | None = None) -> None:
+        """Initialize the API, optionally with a shared client session."""
+        self._session = session
+        self._owns_session = session is None
+
+    async def __aenter__(self) -> "MunichTransportAPI":
+        """Use the API as an async context manager that closes its own session on exit."""
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Close the client session if it is owned by this instance."""
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the client session if it is owned by this instance."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _make_request(self, url: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Make a request to the API, sharing the response of identical in-flight requests."""
+        key = (url, tuple(sorted((params or {}).items())))
+        task = _INFLIGHT.get(key)
+        if task is None:
+            task = _INFLIGHT[key] = asyncio.ensure_future(self._fetch(url, params))
+            task.add_done_callback(functools.partial(_release_inflight, key))
+        # Shield so a cancelled caller does not cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _fetch(self, url: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Fetch and decode a single API response."""
+        if self._session is None:
+            # Created lazily so that a client without a shared session also
+            # works outside of ``async with``
+            self._session = aiohttp.ClientSession()
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status != 200:
-                        _LOGGER.error(f"API request failed with status {response.status}: {url}")
-                        raise APIError(f"API request failed with status {response.status}")
-                    return await response.json()
-        except aiohttp.ClientError as e:
-            _LOGGER.error(f"Network error occurred: {e}")
+            async with self._session.get(
+                    url, params=params, timeout=REQUEST_TIMEOUT, raise_for_status=True
+            ) as response:
+                return _loads(await response.read())
+        except aiohttp.ClientResponseError as e:
+            _LOGGER.error("API request failed with status %s: %s", e.status, url)
+            raise APIError(f"API request failed with status {e.status}") from e
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            _LOGGER.error("Network error occurred: %s", e)
             raise NetworkError(f"Network error: {e}") from e
         except ValueError as e:
-            _LOGGER.error(f"Failed to parse API response: {e}")
+            # orjson.JSONDecodeError is a subclass of ValueError
+            _LOGGER.error("Failed to parse API response: %s", e)
             raise APIError(f"Failed to parse API response: {e}") from e
 
-    @staticmethod
-    async def fetch_stations(query: str) -> List[Dict[str, Any]]:
+    @_AsyncTTLCache(ttl=24 * 60 * 60)
+    async def fetch_stations(self, query: str) -> List[Dict[str, Any]]:
         """Fetch stations based on a search query."""
         try:
-            data = await MunichTransportAPI._make_request(f"{MunichTransportAPI.BASE_URL}/locations", params={"query": query})
+            data = await self._make_request(f"{self.BASE_URL}/locations", params={"query": query})
             stations = [
                 {
                     "id": station["globalId"],
@@ -53,50 +231,31 @@ class MunichTransportAPI:
                 for station in data if station["type"] == "STATION"
             ]
             if not stations:
-                _LOGGER.warning(f"No stations found for query: {query}")
+                _LOGGER.warning("No stations found for query: %s", query)
             return stations
         except MunichTransportAPIError as e:
-            _LOGGER.error(f"Error fetching stations: {e}")
+            _LOGGER.error("Error fetching stations: %s", e)
             raise
 
-    @staticmethod
-    async def fetch_departures(station_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+    @_AsyncTTLCache(ttl=30)
+    async def fetch_departures(self, station_id: str, limit: int = 50) -> List[Departure]:
         """Fetch departures for a given station ID."""
         try:
-            data = await MunichTransportAPI._make_request(f"{MunichTransportAPI.BASE_URL}/departures", params={"globalId": station_id, "limit": limit})
-            departures = [
-                {
-                    "line": dep["label"],
-                    "destination": dep["destination"],
-                    "realtime_departure": dep.get("realtimeDepartureTime", None) / 1000,
-                    "planned_departure": dep.get("plannedDepartureTime", None) / 1000,
-                    "type": dep["transportType"],
-                    "cancelled": dep.get("cancelled", False),
-                    "messages": [msg for msg in dep.get("messages", [])],
-                    "platform": dep.get("platform", None),
-                    "platform_changed": dep.get("platformChanged", False),
-                    "stop_position_number": dep.get("stopPositionNumber", None),
-                    "delay": dep.get("delayInMinutes", 0),
-                    "icon": MunichTransportAPI.get_icon(dep["transportType"]),
-                    "occupancy": dep.get("occupancy", "UNKNOWN"),
-                    "network": dep.get("network", ""),
-
-                }
-                for dep in data
-            ]
-            _LOGGER.debug(f"Departures: {departures}")
+            data = await self._make_request(f"{self.BASE_URL}/departures", params={"globalId": station_id, "limit": limit})
+            departures = _parse_departures(data)
+            _LOGGER.debug("Departures: %s", departures)
             if not departures:
-                _LOGGER.warning(f"No departures found for station ID: {station_id}")
+                _LOGGER.warning("No departures found for station ID: %s", station_id)
             return departures
         except MunichTransportAPIError as e:
-            _LOGGER.error(f"Error fetching departures: {e}")
+            _LOGGER.error("Error fetching departures: %s", e)
             raise
 
-    @staticmethod
-    async def fetch_lines(station_id: str) -> List[Dict[str, Any]]:
+    @_AsyncTTLCache(ttl=600)
+    async def fetch_lines(self, station_id: str) -> List[Dict[str, Any]]:
         """Fetch lines for a given station ID."""
         try:
-            data = await MunichTransportAPI._make_request(f"{MunichTransportAPI.BASE_URL}/lines/{station_id}")
+            data = await self._make_request(f"{self.BASE_URL}/lines/{station_id}")
             lines = [
                 {
                     "label": line["label"],
@@ -106,38 +265,25 @@ class MunichTransportAPI:
                 for line in data
             ]
             if not lines:
-                _LOGGER.warning(f"No lines found for station ID: {station_id}")
+                _LOGGER.warning("No lines found for station ID: %s", station_id)
             return lines
         except MunichTransportAPIError as e:
-            _LOGGER.error(f"Error fetching lines: {e}")
+            _LOGGER.error("Error fetching lines: %s", e)
             raise
 
-    @staticmethod
-    def get_icon(transport_type: str) -> str:
-        """Return the appropriate icon for the transport type."""
-        icons = {
-            "UBAHN": "mdi:subway-variant",
-            "TRAM": "mdi:tram",
-            "SBAHN": "mdi:train",
-            "BUS": "mdi:bus",
-            "REGIONAL_BUS": "mdi:bus-clock",
-            "RUFTAXI": "mdi:taxi",
-        }
-        return icons.get(transport_type, "mdi:train-car")
-
-    @staticmethod
-    async def fetch_messages() -> List[Dict[str, Any]]:
+    @_AsyncTTLCache(ttl=300)
+    async def fetch_messages(self) -> List[Dict[str, Any]]:
         """Fetch messages from the API."""
         try:
-            data = await MunichTransportAPI._make_request(f"{MunichTransportAPI.BASE_URL}/messages")
+            data = await self._make_request(f"{self.BASE_URL}/messages")
             messages = [
                 {
                     "title": msg["title"],
                     "description": msg["description"],
                     "type": msg["type"],
-                    "valid_from": datetime.fromtimestamp(msg.get("validFrom", 0) / 1000).isoformat() if msg.get("validFrom") else None,
-                    "valid_to": datetime.fromtimestamp(msg.get("validTo", 0) / 1000).isoformat() if msg.get("validTo") else None,
-                    "lines": [line["label"] for line in msg.get("lines", [])],
+                    "valid_from": _ms_to_iso(msg.get("validFrom")),
+                    "valid_to": _ms_to_iso(msg.get("validTo")),
+                    "lines": [line["label"] for line in (msg.get("lines") or ())],
                 }
                 for msg in data
             ]
@@ -145,13 +291,12 @@ class MunichTransportAPI:
                 _LOGGER.warning("No messages found")
             return messages
         except MunichTransportAPIError as e:
-            _LOGGER.error(f"Error fetching messages: {e}")
+            _LOGGER.error("Error fetching messages: %s", e)
             raise
 
     @staticmethod
-    def calculate_minutes_until(timestamp: int) -> int:
-        """Calculate minutes until the given timestamp."""
-        departure_time = datetime.fromtimestamp(timestamp)  # Convert milliseconds to seconds
-        now = datetime.now()
-        time_diff = departure_time - now
-        return max(0, int(time_diff.total_seconds() / 60))
\ No newline at end of file
+    def calculate_minutes_until(timestamp: int, now_ts: Optional[float] = None) -> int:
+        """Calculate minutes until the given timestamp, optionally from a given current time."""
+        if now_ts is None:
+            now_ts = time.time()
+        return max(0, int((timestamp - now_ts) // 60))
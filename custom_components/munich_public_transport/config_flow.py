@@ -8,6 +8,7 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import selector
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import MunichTransportAPI
 from .const import DOMAIN, DEFAULT_SCAN_INTERVAL, DEFAULT_DEPARTURE_COUNT
@@ -16,6 +17,28 @@ import logging
 
 _LOGGER = logging.getLogger(__name__)
 
+_USER_SCHEMA = vol.Schema({
+    vol.Required("search_query"): str,
+})
+
+_OTHER_OPTIONS_SCHEMA = vol.Schema({
+    vol.Required("departure_count", default=DEFAULT_DEPARTURE_COUNT): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=1,
+            max=20,
+            mode=selector.NumberSelectorMode.BOX
+        ),
+    ),
+    vol.Required("scan_interval", default=DEFAULT_SCAN_INTERVAL): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=1,
+            max=60,
+            unit_of_measurement="minutes",
+            mode=selector.NumberSelectorMode.BOX
+        ),
+    ),
+})
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Munich Public Transport."""
 
@@ -24,14 +47,32 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self):
         """Initialize the config flow."""
         self.stations = []
+        self._stations_by_name: dict[str, dict[str, Any]] = {}
         self.selected_station = None
-        self.departures = []
+        self.departures = {"line": [], "destination": []}
         self.lines = []
         self.selected_lines = []
         self.directions = set()
         self.selected_directions = []
         self.departure_count = DEFAULT_DEPARTURE_COUNT
         self.scan_interval = DEFAULT_SCAN_INTERVAL
+        self._schema_cache: dict[tuple[str, tuple[str, ...]], vol.Schema] = {}
+
+    def _multi_select_schema(self, key: str, options: list[str]) -> vol.Schema:
+        """Return a multi-select schema with all options selected by default."""
+        cache_key = (key, tuple(options))
+        schema = self._schema_cache.get(cache_key)
+        if schema is None:
+            schema = self._schema_cache[cache_key] = vol.Schema({
+                vol.Required(key, default=list(options)): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=list(options),
+                        multiple=True,
+                        custom_value=False,
+                    ),
+                ),
+            })
+        return schema
 
     async def async_step_user(
             self, user_input: dict[str, Any] | None = None
@@ -40,9 +81,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is None:
             return self.async_show_form(
                 step_id="user",
-                data_schema=vol.Schema({
-                    vol.Required("search_query"): str,
-                }),
+                data_schema=_USER_SCHEMA,
                 description_placeholders={
                     "query_instructions": "Enter part of the station name to search"
                 },
@@ -50,17 +89,18 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         search_query = user_input["search_query"].lower()
         try:
-            all_stations = await MunichTransportAPI.fetch_stations(search_query)
-            self.stations = [
-                station for station in all_stations
+            api = MunichTransportAPI(async_get_clientsession(self.hass))
+            stations = [
+                station for station in await api.fetch_stations(search_query)
                 if search_query in station["name"].lower()
             ]
+            self.stations = stations
+            # Station names are unique in practice; on duplicates the last one wins
+            self._stations_by_name = {station["name"]: station for station in stations}
             if not self.stations:
                 return self.async_show_form(
                     step_id="user",
-                    data_schema=vol.Schema({
-                        vol.Required("search_query"): str,
-                    }),
+                    data_schema=_USER_SCHEMA,
                     errors={"base": "no_stations_found"},
                     description_placeholders={
                         "query_instructions": "No stations found. Try a different search term."
@@ -71,9 +111,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             _LOGGER.error("Error searching for stations: %s", err)
             return self.async_show_form(
                 step_id="user",
-                data_schema=vol.Schema({
-                    vol.Required("search_query"): str,
-                }),
+                data_schema=_USER_SCHEMA,
                 errors={"base": "cannot_connect"},
                 description_placeholders={
                     "query_instructions": "An error occurred. Please try again."
@@ -93,15 +131,19 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 }),
             )
 
-        self.selected_station = next(
-            station for station in self.stations if station["name"] == user_input["station"]
-        )
+        self.selected_station = self._stations_by_name[user_input["station"]]
         try:
-            self.departures = await MunichTransportAPI.fetch_departures(self.selected_station["id"])
+            api = MunichTransportAPI(async_get_clientsession(self.hass))
+            departures = await api.fetch_departures(self.selected_station["id"])
         except Exception as err:
-            _LOGGER.error(f"Error fetching departures: {err}")
+            _LOGGER.error("Error fetching departures: %s", err)
             return self.async_abort(reason="cannot_connect")
 
+        # Only the line and destination columns are needed by the following steps
+        self.departures = {
+            "line": [dep.line for dep in departures],
+            "destination": [dep.destination for dep in departures],
+        }
         return await self.async_step_select_lines()
 
     async def async_step_select_lines(
@@ -109,18 +151,10 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     ) -> FlowResult:
         """Handle the line selection step."""
         if user_input is None:
-            self.lines = sorted(set(dep["line"] for dep in self.departures))
+            self.lines = sorted(set(self.departures["line"]))
             return self.async_show_form(
                 step_id="select_lines",
-                data_schema=vol.Schema({
-                    vol.Required("lines", default=self.lines): selector.SelectSelector(
-                        selector.SelectSelectorConfig(
-                            options=self.lines,
-                            multiple=True,
-                            custom_value=False,
-                        ),
-                    ),
-                }),
+                data_schema=self._multi_select_schema("lines", self.lines),
                 description_placeholders={
                     "instructions": "Select the lines you want to track (all are selected by default)"
                 },
@@ -134,21 +168,15 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     ) -> FlowResult:
         """Handle the direction selection step."""
         if user_input is None:
-            self.directions = sorted(set(
-                dep["destination"] for dep in self.departures
-                if dep["line"] in self.selected_lines
-            ))
+            selected_lines = frozenset(self.selected_lines)
+            self.directions = sorted({
+                destination
+                for line, destination in zip(self.departures["line"], self.departures["destination"])
+                if line in selected_lines
+            })
             return self.async_show_form(
                 step_id="select_directions",
-                data_schema=vol.Schema({
-                    vol.Required("directions", default=self.directions): selector.SelectSelector(
-                        selector.SelectSelectorConfig(
-                            options=list(self.directions),
-                            multiple=True,
-                            custom_value=False,
-                        ),
-                    ),
-                }),
+                data_schema=self._multi_select_schema("directions", self.directions),
                 description_placeholders={
                     "instructions": "Select the directions you want to track (all are selected by default)"
                 },
@@ -164,23 +192,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is None:
             return self.async_show_form(
                 step_id="other_options",
-                data_schema=vol.Schema({
-                    vol.Required("departure_count", default=DEFAULT_DEPARTURE_COUNT): selector.NumberSelector(
-                        selector.NumberSelectorConfig(
-                            min=1,
-                            max=20,
-                            mode=selector.NumberSelectorMode.BOX
-                        ),
-                    ),
-                    vol.Required("scan_interval", default=DEFAULT_SCAN_INTERVAL): selector.NumberSelector(
-                        selector.NumberSelectorConfig(
-                            min=1,
-                            max=60,
-                            unit_of_measurement="minutes",
-                            mode=selector.NumberSelectorMode.BOX
-                        ),
-                    ),
-                }),
+                data_schema=_OTHER_OPTIONS_SCHEMA,
             )
 
         self.departure_count = user_input["departure_count"]
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from .api import MunichTransportAPI
+from .api import Departure, MunichTransportAPI
 from homeassistant.components.sensor import (
     SensorEntity,
     SensorStateClass,
@@ -8,7 +8,6 @@ from homeassistant.components.sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
@@ -19,12 +18,21 @@ from homeassistant.const import (
     UnitOfTime,
 )
 from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers.entity_registry import async_get as async_get_entity_registry
+from homeassistant.helpers.entity_registry import (
+    async_entries_for_config_entry,
+    async_get as async_get_entity_registry,
+)
 
 from .const import DOMAIN, DEFAULT_SCAN_INTERVAL, DEFAULT_DEPARTURE_COUNT
 
+import asyncio
+import heapq
+from abc import abstractmethod
 import logging
+import time
+from operator import attrgetter
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any
 
 
@@ -34,181 +42,273 @@ ATTRIBUTION = "Data provided by MVG"
 
 DEFAULT_ICON = "mdi:train-car"
 
+MESSAGE_UPDATE_INTERVAL = timedelta(minutes=30)
+QUIET_UPDATE_INTERVAL = timedelta(minutes=10)
+
+PARSE_CACHE_SIZE = 512
+
+_BY_REALTIME_DEPARTURE = attrgetter("realtime_departure")
+_LINE_AND_DESTINATION = attrgetter("line", "destination")
+_ALL_DEPARTURES_ONLY_KEYS = frozenset(("line", "destination", "type"))
+_DEPARTURE_COLUMNS = attrgetter(
+    "realtime_departure", "planned_departure", "line", "destination", "delay",
+    "type", "occupancy", "cancelled", "network",
+)
+
+# Signature of a sensor that has not been written by a coordinator update yet
+_UNSET = object()
+
+
+def _current_minute() -> int:
+    """Return the current wall-clock minute as an epoch minute count."""
+    return int(time.time() // 60)
+
+
+@lru_cache(maxsize=2048)
+def _format_hhmm(timestamp: int) -> str:
+    """Format an epoch timestamp as local HH:MM."""
+    return time.strftime("%H:%M", time.localtime(timestamp))
+
+
+def _empty_departures() -> dict[str, Any]:
+    """Return the departure data of a station without departures."""
+    return {"all": (), "grouped": {}, "next": None, "rows": {}}
+
+
+def _departure_rows(dep: Departure) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Return the attribute rows of a departure for the all departures and line sensors.
+
+    The countdown changes every minute, so the rows only hold a placeholder for it
+    that the sensors fill in when building their attributes.
+    """
+    realtime, planned, line, destination, delay, dep_type, occupancy, cancelled, network = _DEPARTURE_COLUMNS(dep)
+    row = {
+        "line": line,
+        "destination": destination,
+        "realtime_departure": _format_hhmm(realtime),
+        "planned_departure": _format_hhmm(planned),
+        "delay": delay,
+        "minutes_until_departure": None,
+        "type": dep_type,
+        "occupancy": occupancy,
+        "cancelled": cancelled,
+        "network": network,
+    }
+
+    # Add new attributes if they exist
+    if dep.platform is not None:
+        row["platform"] = dep.platform
+        row["platform_changed"] = dep.platform_changed
+    if dep.stop_position_number is not None:
+        row["stop_position_number"] = dep.stop_position_number
+
+    line_row = {key: value for key, value in row.items() if key not in _ALL_DEPARTURES_ONLY_KEYS}
+    return row, line_row
+
+
+def _parse_int(value: Any, default: int, name: str) -> int:
+    """Return the setting as an integer, or the default if it is missing or invalid."""
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        _LOGGER.warning("Invalid %s, using default of %s", name, default)
+        return default
+
+
+def _sensor_unique_id(entry_id: str, station_name: str, key: str) -> str:
+    """Return the unique ID of a station sensor."""
+    return f"{entry_id}_{station_name}_{key}"
+
+
+def _line_sensor_unique_id(entry_id: str, station_name: str, line: str, destination: str) -> str:
+    """Return the unique ID of the sensor for a line and destination."""
+    return _sensor_unique_id(entry_id, station_name, f"{line}_{destination}")
+
+
 async def async_setup_entry(
         hass: HomeAssistant,
         config_entry: ConfigEntry,
         async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Munich Public Transport sensors."""
-    _LOGGER.debug(f"Setting up sensor for config entry: {config_entry.data}")
+    _LOGGER.debug("Setting up sensor for config entry: %s", config_entry.data)
 
     station_id = config_entry.data["station_id"]
     station_name = config_entry.data["station_name"]
-    selected_lines = config_entry.options.get("lines", config_entry.data.get("lines", []))
-    selected_directions = config_entry.options.get("directions", config_entry.data.get("directions", []))
+    cfg = {**config_entry.data, **config_entry.options}
+    selected_lines = cfg.get("lines", [])
+    selected_directions = cfg.get("directions", [])
 
-    try:
-        departure_count = int(config_entry.options.get("departure_count", config_entry.data.get("departure_count", DEFAULT_DEPARTURE_COUNT)))
-    except ValueError:
-        _LOGGER.warning(f"Invalid departure_count, using default of {DEFAULT_DEPARTURE_COUNT}")
-        departure_count = DEFAULT_DEPARTURE_COUNT
+    departure_count = _parse_int(cfg.get("departure_count"), DEFAULT_DEPARTURE_COUNT, "departure_count")
+    scan_interval = timedelta(minutes=_parse_int(cfg.get("scan_interval"), DEFAULT_SCAN_INTERVAL, "scan_interval"))
 
-    try:
-        scan_interval = timedelta(minutes=int(config_entry.options.get("scan_interval", config_entry.data.get("scan_interval", DEFAULT_SCAN_INTERVAL))))
-    except ValueError:
-        _LOGGER.warning(f"Invalid scan_interval, using default of {DEFAULT_SCAN_INTERVAL} minutes")
-        scan_interval = timedelta(minutes=DEFAULT_SCAN_INTERVAL)
+    api: MunichTransportAPI = hass.data[DOMAIN][config_entry.entry_id]["api"]
+
+    _LOGGER.debug(
+        "Station: %s, Lines: %s, Directions: %s, Count: %s, Scan Interval: %s",
+        station_name, selected_lines, selected_directions, departure_count, scan_interval,
+    )
+
+    line_set = frozenset(selected_lines)
+    direction_set = frozenset(selected_directions)
 
-    _LOGGER.debug(f"Station: {station_name}, Lines: {selected_lines}, Directions: {selected_directions}, Count: {departure_count}, Scan Interval: {scan_interval}")
+    configured_interval = scan_interval
 
     async def async_update_departures():
         """Fetch data from API."""
         try:
-            _LOGGER.debug(f"Fetching departures for station {station_id} ({station_name})")
-            departures = await MunichTransportAPI.fetch_departures(station_id)
-            _LOGGER.debug(f"Fetched {len(departures)} departures")
+            _LOGGER.debug("Fetching departures for station %s (%s)", station_id, station_name)
+            departures = await api.fetch_departures(station_id)
+            _LOGGER.debug("Fetched %d departures", len(departures))
 
-            # Group departures by line and destination
+            # Group departures by line and destination, keeping the earliest
+            # departure_count of each; the fetched list is shared, so sort a copy
             grouped_departures = {}
-            for dep in departures:
-                if (not selected_lines or dep["line"] in selected_lines) and \
-                        (not selected_directions or dep["destination"] in selected_directions):
-                    key = (dep['line'], dep['destination'])
-                    if key not in grouped_departures:
-                        grouped_departures[key] = []
-                    grouped_departures[key].append(dep)
-
-            # Sort and limit each group to departure_count
-            for key in grouped_departures:
-                grouped_departures[key] = sorted(grouped_departures[key], key=lambda x: x['realtime_departure'])[:departure_count]
-
-            # Create a flat list of all filtered departures
-            all_filtered_departures = [
-                dep for departures in grouped_departures.values() for dep in departures
-            ]
-            all_filtered_departures.sort(key=lambda x: x['realtime_departure'])
+            add_to_group = grouped_departures.setdefault
+            for dep in sorted(departures, key=_BY_REALTIME_DEPARTURE):
+                key = _LINE_AND_DESTINATION(dep)
+                if (not line_set or key[0] in line_set) and (not direction_set or key[1] in direction_set):
+                    group = add_to_group(key, [])
+                    if len(group) < departure_count:
+                        group.append(dep)
+
+            # Merge the sorted groups into a flat tuple of all filtered departures
+            all_filtered_departures = tuple(heapq.merge(*grouped_departures.values(), key=_BY_REALTIME_DEPARTURE))
+
+            _LOGGER.debug("Filtered to %d departures across all lines/directions", len(all_filtered_departures))
 
-            _LOGGER.debug(f"Filtered to {len(all_filtered_departures)} departures across all lines/directions")
+            # Poll less often while the station is quiet, e.g. at night
+            if not all_filtered_departures:
+                coordinator.update_interval = max(configured_interval, QUIET_UPDATE_INTERVAL)
+                return _empty_departures()
+            coordinator.update_interval = configured_interval
 
             return {
                 "all": all_filtered_departures,
-                "grouped": grouped_departures,
-                "next": all_filtered_departures[0] if all_filtered_departures else None
+                "grouped": {key: tuple(group) for key, group in grouped_departures.items()},
+                "next": all_filtered_departures[0],
+                # Format the departures once for all sensors
+                "rows": {dep: _departure_rows(dep) for dep in all_filtered_departures},
             }
         except Exception as err:
-            _LOGGER.error(f"Error communicating with API: {err}", exc_info=True)
-            return {
-                "all": [],
-                "grouped": {},
-                "next": None
-            }
+            _LOGGER.error("Error communicating with API: %s", err, exc_info=True)
+            return _empty_departures()
+
+    messages: list[dict[str, Any]] = []
+    messages_fetched_at: float | None = None
 
     async def async_update_messages():
-        """Fetch message data from API."""
+        """Fetch message data from API, at most once per message update interval."""
+        nonlocal messages, messages_fetched_at
+        now = time.monotonic()
+        if messages_fetched_at is not None and now - messages_fetched_at < MESSAGE_UPDATE_INTERVAL.total_seconds():
+            return messages
         try:
             _LOGGER.debug("Fetching transport messages")
-            messages = await MunichTransportAPI.fetch_messages()
-            _LOGGER.debug(f"Fetched {len(messages)} messages")
-            return {"messages": messages}
+            messages = await api.fetch_messages()
+            messages_fetched_at = now
+            _LOGGER.debug("Fetched %d messages", len(messages))
         except Exception as err:
-            _LOGGER.error(f"Error fetching messages: {err}", exc_info=True)
-            return {"messages": []}
+            _LOGGER.error("Error fetching messages: %s", err, exc_info=True)
+        return messages
+
+    async def async_update_data():
+        """Fetch departures and messages from API concurrently."""
+        departure_data, message_data = await asyncio.gather(
+            async_update_departures(), async_update_messages()
+        )
+        return {**departure_data, "messages": message_data}
 
-    departure_coordinator = DataUpdateCoordinator(
+    coordinator = DataUpdateCoordinator(
         hass,
         _LOGGER,
         name="munich_public_transport",
-        update_method=async_update_departures,
+        update_method=async_update_data,
         update_interval=scan_interval,
     )
 
-    message_coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name="munich_public_transport_messages",
-        update_method=async_update_messages,
-        update_interval=timedelta(minutes=30),
-    )
-
-    await departure_coordinator.async_config_entry_first_refresh()
-    await message_coordinator.async_config_entry_first_refresh()
+    await coordinator.async_config_entry_first_refresh()
 
-    if departure_coordinator.data is None or message_coordinator.data is None:
+    if coordinator.data is None:
         raise ConfigEntryNotReady("Failed to fetch initial data")
 
-    entities = [
-        NextDepartureSensor(departure_coordinator, station_name, config_entry),
-        AllDeparturesSensor(departure_coordinator, station_name, config_entry),
-        MessagesSensor(message_coordinator, station_name, config_entry, selected_lines)
-    ]
+    # Line sensors by (line, destination) and the keys of the added ones by
+    # entity ID, shared through hass.data
+    line_sensors: dict[tuple[str, str], LineSensor] = {}
+    line_sensor_keys: dict[str, tuple[str, str]] = {}
+    hass.data[DOMAIN][config_entry.entry_id]["line_sensors"] = line_sensors
+    hass.data[DOMAIN][config_entry.entry_id]["line_sensor_keys"] = line_sensor_keys
 
-    for (line, destination) in departure_coordinator.data["grouped"].keys():
+    for (line, destination) in coordinator.data["grouped"].keys():
         if line in selected_lines and destination in selected_directions:
-            entities.append(LineSensor(departure_coordinator, station_name, line, destination, config_entry))
+            line_sensors[(line, destination)] = LineSensor(coordinator, station_name, line, destination, config_entry)
 
-    async_add_entities(entities, True)
+    messages_sensor = MessagesSensor(coordinator, station_name, config_entry, selected_lines)
+    entities = [
+        NextDepartureSensor(coordinator, station_name, config_entry),
+        AllDeparturesSensor(coordinator, station_name, config_entry),
+        messages_sensor,
+        *line_sensors.values(),
+    ]
 
-    @callback
-    def async_update_sensors(entry: ConfigEntry) -> None:
-        """Update sensors based on config entry update."""
-        _LOGGER.debug(f"Updating sensors for config entry: {entry.data}")
+    async_add_entities(entities, True)
 
-        new_selected_lines = entry.options.get("lines", entry.data.get("lines", []))
-        new_selected_directions = entry.options.get("directions", entry.data.get("directions", []))
+    def wanted_unique_ids(entry_id: str, line_keys: list[tuple[str, str]]) -> set[str]:
+        """Return the unique IDs of all sensors the entry should have."""
+        wanted = {
+            _sensor_unique_id(entry_id, station_name, key)
+            for key in ("next_departure", "all_departures", "messages")
+        }
+        wanted.update(
+            _line_sensor_unique_id(entry_id, station_name, line, direction)
+            for line, direction in line_keys
+        )
+        return wanted
+
+    async def async_update_sensors(hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Apply changed options to the coordinator and the sensors in place."""
+        nonlocal line_set, direction_set, departure_count, configured_interval
+        _LOGGER.debug("Updating sensors for config entry: %s", entry.data)
+
+        cfg = {**entry.data, **entry.options}
+        new_selected_lines = cfg.get("lines", [])
+        new_selected_directions = cfg.get("directions", [])
+        line_keys = [(line, direction) for line in new_selected_lines for direction in new_selected_directions]
+
+        # Regroup the departures with the new options before touching the sensors
+        line_set = frozenset(new_selected_lines)
+        direction_set = frozenset(new_selected_directions)
+        departure_count = _parse_int(cfg.get("departure_count"), DEFAULT_DEPARTURE_COUNT, "departure_count")
+        configured_interval = timedelta(minutes=_parse_int(cfg.get("scan_interval"), DEFAULT_SCAN_INTERVAL, "scan_interval"))
+        coordinator.update_interval = configured_interval
+        messages_sensor.set_selected_lines(new_selected_lines)
+        await coordinator.async_refresh()
 
         entity_reg = async_get_entity_registry(hass)
-        entries = entity_reg.entities.values()
+        wanted = wanted_unique_ids(entry.entry_id, line_keys)
 
         # Remove entities that are no longer needed
-        for entity_entry in entries:
-            if entity_entry.config_entry_id == entry.entry_id and entity_entry.unique_id.startswith(f"{DOMAIN}_{station_name}_"):
-                parts = entity_entry.unique_id.split('_')
-                if len(parts) >= 4:  # Ensure it's a line sensor
-                    line = parts[2]
-                    direction = '_'.join(parts[3:])
-                    if line not in new_selected_lines or direction not in new_selected_directions:
-                        _LOGGER.debug(f"Removing entity: {entity_entry.entity_id}")
-                        entity_reg.async_remove(entity_entry.entity_id)
+        for entity_entry in async_entries_for_config_entry(entity_reg, entry.entry_id):
+            if entity_entry.unique_id not in wanted:
+                _LOGGER.debug("Removing entity: %s", entity_entry.entity_id)
+                entity_reg.async_remove(entity_entry.entity_id)
+                if (key := line_sensor_keys.pop(entity_entry.entity_id, None)) is not None:
+                    line_sensors.pop(key, None)
 
         # Add new entities if needed
-        current_entities = set(entity.unique_id for entity in entities)
-        for line in new_selected_lines:
-            for direction in new_selected_directions:
-                unique_id = f"{DOMAIN}_{station_name}_{line}_{direction}"
-                if unique_id not in current_entities:
-                    _LOGGER.debug(f"Adding new entity: {unique_id}")
-                    new_entity = LineSensor(departure_coordinator, station_name, line, direction, entry)
-                    entities.append(new_entity)
-                    async_add_entities([new_entity], True)
-
-        # Update coordinator
-        departure_coordinator.update_interval = timedelta(minutes=int(entry.options.get("scan_interval", entry.data.get("scan_interval", DEFAULT_SCAN_INTERVAL))))
-
-    config_entry.async_on_unload(config_entry.add_update_listener(async_update_sensors))
+        new_entities = []
+        for key in line_keys:
+            if key not in line_sensors:
+                sensor = line_sensors[key] = LineSensor(coordinator, station_name, *key, entry)
+                new_entities.append(sensor)
+        if new_entities:
+            _LOGGER.debug("Adding new entities: %s", [entity.unique_id for entity in new_entities])
+            async_add_entities(new_entities, True)
 
     config_entry.async_on_unload(config_entry.add_update_listener(async_update_sensors))
 
-    async def async_remove_outdated_entities(hass: HomeAssistant, entry: ConfigEntry) -> None:
-        """Remove entities that are no longer needed."""
-        entity_reg = async_get_entity_registry(hass)
-        entries = entity_reg.entities.values()
-
-        selected_lines = entry.options.get("lines", entry.data.get("lines", []))
-        selected_directions = entry.options.get("directions", entry.data.get("directions", []))
-
-        for entity_entry in entries:
-            if entity_entry.config_entry_id == entry.entry_id and entity_entry.unique_id.startswith(f"{DOMAIN}_{station_name}_"):
-                parts = entity_entry.unique_id.split('_')
-                if len(parts) >= 4:  # Ensure it's a line sensor
-                    line = parts[2]
-                    direction = '_'.join(parts[3:])
-                    if line not in selected_lines or direction not in selected_directions:
-                        entity_reg.async_remove(entity_entry.entity_id)
-
-    config_entry.async_on_unload(
-        config_entry.add_update_listener(async_remove_outdated_entities)
-    )
-
 
 class MunichTransportBaseSensor(CoordinatorEntity, SensorEntity):
     """Base class for Munich Transport sensors."""
@@ -228,18 +328,24 @@ class MunichTransportBaseSensor(CoordinatorEntity, SensorEntity):
             "manufacturer": "MVG",
             "model": "Public Transport Station",
         }
+        self._last_signature: Any = _UNSET
 
-    async def async_added_to_hass(self):
-        """When entity is added to hass."""
-        await super().async_added_to_hass()
-        self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
-        )
+    @abstractmethod
+    def _update_state(self) -> None:
+        """Compute the state and attributes from the current coordinator data."""
+
+    @abstractmethod
+    def _state_signature(self) -> Any:
+        """Return a value that changes whenever the state of the sensor may change."""
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self.async_write_ha_state()
+        """Write the state only if the data this sensor shows has changed."""
+        signature = self._state_signature()
+        if signature != self._last_signature:
+            self._last_signature = signature
+            self._update_state()
+            super()._handle_coordinator_update()
 
 class NextDepartureSensor(MunichTransportBaseSensor):
     """Sensor for the next departure."""
@@ -247,47 +353,44 @@ class NextDepartureSensor(MunichTransportBaseSensor):
     def __init__(self, departure_coordinator, station_name: str, config_entry: ConfigEntry) -> None:
         """Initialize the sensor."""
         super().__init__(departure_coordinator, station_name, config_entry)
-        self._attr_unique_id = f"{config_entry.entry_id}_{station_name}_next_departure"
+        self._attr_unique_id = _sensor_unique_id(config_entry.entry_id, station_name, "next_departure")
         self._attr_name = "Next Departure"
-
-    @property
-    def icon(self) -> str:
-        """Return the icon of the sensor."""
-        if self.coordinator.data["next"]:
-            return self.coordinator.data["next"]['icon']
-        return DEFAULT_ICON
-
-    @property
-    def native_value(self) -> StateType:
-        """Return the state of the sensor."""
-        if self.coordinator.data["next"]:
-            return MunichTransportAPI.calculate_minutes_until(self.coordinator.data["next"]['realtime_departure'])
-        return None
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return the state attributes."""
+        self._update_state()
+
+    def _state_signature(self) -> Any:
+        """Return the next departure and, while there is one, the current minute."""
+        next_dep = self.coordinator.data["next"]
+        return (next_dep, _current_minute()) if next_dep else None
+
+    def _update_state(self) -> None:
+        """Compute the minutes until the next departure, the icon and the attributes."""
+        next_dep = self.coordinator.data["next"]
+        self._attr_native_value = MunichTransportAPI.calculate_minutes_until(next_dep.realtime_departure) if next_dep else None
+        self._attr_icon = next_dep.icon if next_dep else DEFAULT_ICON
+        self._attr_extra_state_attributes = self._build_extra_state_attributes(next_dep)
+
+    def _build_extra_state_attributes(self, next_dep: Departure | None) -> dict[str, Any]:
+        """Build the state attributes of the given next departure."""
         attrs = {ATTR_ATTRIBUTION: ATTRIBUTION}
-        if self.coordinator.data["next"]:
-            next_dep = self.coordinator.data["next"]
+        if next_dep:
             attrs.update({
-                "line": next_dep['line'],
-                "destination": next_dep['destination'],
-                "realtime_departure": datetime.fromtimestamp(next_dep['realtime_departure']).strftime("%H:%M"),
-                "planned_departure": datetime.fromtimestamp(next_dep['planned_departure']).strftime("%H:%M"),
-                "delay": next_dep['delay'],
-                "is_late": next_dep['realtime_departure'] > next_dep['planned_departure'],
-                "type": next_dep['type'],
-                "occupancy": next_dep['occupancy'],
-                "cancelled": next_dep['cancelled'],
-                "network": next_dep['network'],
+                "line": next_dep.line,
+                "destination": next_dep.destination,
+                "realtime_departure": _format_hhmm(next_dep.realtime_departure),
+                "planned_departure": _format_hhmm(next_dep.planned_departure),
+                "delay": next_dep.delay,
+                "is_late": next_dep.realtime_departure > next_dep.planned_departure,
+                "type": next_dep.type,
+                "occupancy": next_dep.occupancy,
+                "cancelled": next_dep.cancelled,
+                "network": next_dep.network,
             })
-            if next_dep['platform'] is not None:
-                attrs["platform"] = next_dep['platform']
-                attrs["platform_changed"] = next_dep['platform_changed']
+            if next_dep.platform is not None:
+                attrs["platform"] = next_dep.platform
+                attrs["platform_changed"] = next_dep.platform_changed
             # _LOGGER.info(next_dep)
-            if next_dep['stop_position_number'] is not None:
-                attrs["stop_position_number"] = next_dep['stop_position_number']
+            if next_dep.stop_position_number is not None:
+                attrs["stop_position_number"] = next_dep.stop_position_number
         return attrs
 
 class AllDeparturesSensor(MunichTransportBaseSensor):
@@ -296,51 +399,31 @@ class AllDeparturesSensor(MunichTransportBaseSensor):
     def __init__(self, departure_coordinator, station_name: str, config_entry: ConfigEntry) -> None:
         """Initialize the sensor."""
         super().__init__(departure_coordinator, station_name, config_entry)
-        self._attr_unique_id = f"{config_entry.entry_id}_{station_name}_all_departures"
+        self._attr_unique_id = _sensor_unique_id(config_entry.entry_id, station_name, "all_departures")
         self._attr_name = "All Departures"
-        self._attr_icon = "mdi:train-car-multiple"
-
-    @property
-    def icon(self) -> str:
-        """Return the icon of the sensor."""
-        if self.coordinator.data["all"]:
-            return self.coordinator.data["all"][0]['icon']
-        return DEFAULT_ICON
-
-    @property
-    def native_value(self) -> StateType:
-        """Return the minutes until the next departure across all lines."""
-        if self.coordinator.data["all"]:
-            return MunichTransportAPI.calculate_minutes_until(self.coordinator.data["all"][0]['realtime_departure'])
-        return None
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return the state attributes."""
+        self._update_state()
+
+    def _state_signature(self) -> Any:
+        """Return all departures and, while there are any, the current minute."""
+        departures = self.coordinator.data["all"]
+        return (departures, _current_minute()) if departures else None
+
+    def _update_state(self) -> None:
+        """Compute the minutes until the next departure across all lines, the icon and the attributes."""
+        departures = self.coordinator.data["all"]
+        self._attr_native_value = MunichTransportAPI.calculate_minutes_until(departures[0].realtime_departure) if departures else None
+        self._attr_icon = departures[0].icon if departures else DEFAULT_ICON
+        self._attr_extra_state_attributes = self._build_extra_state_attributes()
+
+    def _build_extra_state_attributes(self) -> dict[str, Any]:
+        """Build the state attributes."""
         attrs = {ATTR_ATTRIBUTION: ATTRIBUTION}
-        attrs["departures"] = []
-        for dep in self.coordinator.data["all"]:
-            departure_info = {
-                "line": dep['line'],
-                "destination": dep['destination'],
-                "realtime_departure": datetime.fromtimestamp(dep['realtime_departure']).strftime("%H:%M"),
-                "planned_departure": datetime.fromtimestamp(dep['planned_departure']).strftime("%H:%M"),
-                "delay": dep['delay'],
-                "minutes_until_departure": MunichTransportAPI.calculate_minutes_until(dep['realtime_departure']),
-                "type": dep['type'],
-                "occupancy": dep['occupancy'],
-                "cancelled": dep['cancelled'],
-                "network": dep['network'],
-            }
-
-            # Add new attributes if they exist
-            if dep.get("platform") is not None:
-                departure_info["platform"] = dep['platform']
-                departure_info["platform_changed"] = dep.get('platform_changed', False)
-            if dep.get("stop_position_number") is not None:
-                departure_info["stop_position_number"] = dep['stop_position_number']
-
-            attrs["departures"].append(departure_info)
+        rows = self.coordinator.data["rows"]
+        now = time.time()
+        attrs["departures"] = [
+            {**rows[dep][0], "minutes_until_departure": MunichTransportAPI.calculate_minutes_until(dep.realtime_departure, now)}
+            for dep in self.coordinator.data["all"]
+        ]
 
         attrs["total_departures"] = len(attrs["departures"])
         return attrs
@@ -353,51 +436,54 @@ class LineSensor(MunichTransportBaseSensor):
         super().__init__(departure_coordinator, station_name, config_entry)
         self._line = line
         self._destination = destination
-        self._attr_unique_id = f"{config_entry.entry_id}_{station_name}_{line}_{destination}"
+        self._attr_unique_id = _line_sensor_unique_id(config_entry.entry_id, station_name, line, destination)
         self._attr_name = f"{line} → {destination}"
+        self._key = (line, destination)
+        self._departures = self.coordinator.data["grouped"].get(self._key, ())
+        self._update_state()
 
-    @property
-    def icon(self) -> str:
-        """Return the icon of the sensor."""
-        departures = self.coordinator.data["grouped"].get((self._line, self._destination), [])
-        if departures:
-            return departures[0]['icon']
-        return DEFAULT_ICON
+    async def async_added_to_hass(self) -> None:
+        """Register the sensor's line and destination under its entity ID."""
+        await super().async_added_to_hass()
+        self.hass.data[DOMAIN][self._config_entry.entry_id]["line_sensor_keys"][self.entity_id] = self._key
 
-    @property
-    def native_value(self) -> StateType:
-        """Return the state of the sensor."""
-        departures = self.coordinator.data["grouped"].get((self._line, self._destination), [])
-        if departures:
-            return MunichTransportAPI.calculate_minutes_until(departures[0]['realtime_departure'])
-        return None
+    async def async_will_remove_from_hass(self) -> None:
+        """Unregister the sensor's line and destination."""
+        await super().async_will_remove_from_hass()
+        entry_data = self.hass.data[DOMAIN].get(self._config_entry.entry_id)
+        if entry_data is not None:
+            entry_data["line_sensor_keys"].pop(self.entity_id, None)
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return the state attributes."""
+    def _state_signature(self) -> Any:
+        """Return the line's departures and, while there are any, the current minute."""
+        return (self._departures, _current_minute()) if self._departures else None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._departures = self.coordinator.data["grouped"].get(self._key, ())
+        super()._handle_coordinator_update()
+
+    def _update_state(self) -> None:
+        """Compute the minutes until the line's next departure, the icon and the attributes."""
+        departures = self._departures
+        self._attr_native_value = MunichTransportAPI.calculate_minutes_until(departures[0].realtime_departure) if departures else None
+        self._attr_icon = departures[0].icon if departures else DEFAULT_ICON
+        self._attr_extra_state_attributes = self._build_extra_state_attributes()
+
+    def _build_extra_state_attributes(self) -> dict[str, Any]:
+        """Build the state attributes."""
         attrs = {ATTR_ATTRIBUTION: ATTRIBUTION}
-        departures = self.coordinator.data["grouped"].get((self._line, self._destination), [])
+        departures = self._departures
         if departures:
-            attrs["departures"] = []
-            for dep in departures:
-                departure_info = {
-                    "realtime_departure": datetime.fromtimestamp(dep['realtime_departure']).strftime("%H:%M"),
-                    "planned_departure": datetime.fromtimestamp(dep['planned_departure']).strftime("%H:%M"),
-                    "delay": dep['delay'],
-                    "minutes_until_departure": MunichTransportAPI.calculate_minutes_until(dep['realtime_departure']),
-                    "occupancy": dep['occupancy'],
-                    "cancelled": dep['cancelled'],
-                    "network": dep['network'],
-                }
-                if dep.get("platform") is not None:
-                    departure_info["platform"] = dep['platform']
-                    departure_info["platform_changed"] = dep.get('platform_changed', False)
-                if dep.get("stop_position_number") is not None:
-                    departure_info["stop_position_number"] = dep['stop_position_number']
-
-                attrs["departures"].append(departure_info)
-
-            attrs["type"] = departures[0]['type']
+            rows = self.coordinator.data["rows"]
+            now = time.time()
+            attrs["departures"] = [
+                {**rows[dep][1], "minutes_until_departure": MunichTransportAPI.calculate_minutes_until(dep.realtime_departure, now)}
+                for dep in departures
+            ]
+
+            attrs["type"] = departures[0].type
         return attrs
 
 class MessagesSensor(CoordinatorEntity, SensorEntity):
@@ -409,10 +495,11 @@ class MessagesSensor(CoordinatorEntity, SensorEntity):
     def __init__(self, coordinator, station_name: str, config_entry: ConfigEntry, selected_lines: list[str]) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._attr_unique_id = f"{config_entry.entry_id}_{station_name}_messages"
+        self._attr_unique_id = _sensor_unique_id(config_entry.entry_id, station_name, "messages")
         self._attr_name = "Messages"
         self._attr_icon = "mdi:message-alert"
-        self._selected_lines = selected_lines
+        self._selected_lines = frozenset(selected_lines)
+        self._parsed: dict[str, float] = {}
         self._attr_native_unit_of_measurement = "messages"
         self._attr_device_info = {
             "identifiers": {(DOMAIN, f"{config_entry.entry_id}_{station_name}")},
@@ -420,30 +507,48 @@ class MessagesSensor(CoordinatorEntity, SensorEntity):
             "manufacturer": "MVG",
             "model": "Public Transport Station",
         }
+        self._filtered: list[dict[str, Any]] = []
+        self._formatted: list[dict[str, Any]] = []
+        self._update_messages()
 
-    @property
-    def native_value(self) -> StateType:
-        """Return the state of the sensor."""
-        return len(self._filter_messages(self.coordinator.data["messages"]))
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return the state attributes."""
-        attrs = {ATTR_ATTRIBUTION: ATTRIBUTION}
-        filtered_messages = self._filter_messages(self.coordinator.data["messages"])
-        attrs["messages"] = [self._format_message(msg) for msg in filtered_messages]
-        return attrs
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator, writing only changed messages."""
+        formatted = self._formatted
+        self._update_messages()
+        if self._formatted != formatted:
+            super()._handle_coordinator_update()
+
+    def set_selected_lines(self, selected_lines: list[str]) -> None:
+        """Set the lines whose messages are shown, applied on the next coordinator update."""
+        self._selected_lines = frozenset(selected_lines)
+
+    def _update_messages(self) -> None:
+        """Filter and format the messages of the current coordinator data."""
+        self._filtered = self._filter_messages(self.coordinator.data["messages"])
+        self._formatted = [self._format_message(msg) for msg in self._filtered]
+        self._attr_native_value = len(self._filtered)
+        self._attr_extra_state_attributes = {ATTR_ATTRIBUTION: ATTRIBUTION, "messages": self._formatted}
 
     def _filter_messages(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Filter messages relevant to this station."""
-        now = datetime.now()
+        now_ts = time.time()
         return [
             msg for msg in messages
-            if (not msg['lines'] or any(line in self._selected_lines for line in msg['lines'])) and
-               (not msg['valid_from'] or datetime.fromisoformat(msg['valid_from']) <= now) and
-               (not msg['valid_to'] or datetime.fromisoformat(msg['valid_to']) >= now)
+            if (not msg['lines'] or not self._selected_lines.isdisjoint(msg['lines'])) and
+               (not msg['valid_from'] or self._parse_ts(msg['valid_from']) <= now_ts) and
+               (not msg['valid_to'] or self._parse_ts(msg['valid_to']) >= now_ts)
         ]
 
+    def _parse_ts(self, value: str) -> float:
+        """Parse an ISO timestamp to epoch seconds, reusing earlier results for the same string."""
+        parsed = self._parsed.get(value)
+        if parsed is None:
+            if len(self._parsed) >= PARSE_CACHE_SIZE:
+                self._parsed.clear()
+            parsed = self._parsed[value] = datetime.fromisoformat(value).timestamp()
+        return parsed
+
     def _format_message(self, msg: dict[str, Any]) -> dict[str, Any]:
         """Format a single message."""
         return {
@@ -460,17 +565,17 @@ class MessagesSensor(CoordinatorEntity, SensorEntity):
 
     def _format_validity(self, valid_from: str, valid_to: str) -> str:
         """Format the validity period."""
-        from_date = datetime.fromisoformat(valid_from) if valid_from else None
-        to_date = datetime.fromisoformat(valid_to) if valid_to else None
-
-        if from_date and to_date:
-            if from_date.date() == to_date.date():
-                return f"{from_date.strftime('%d.%m.%Y')} {from_date.strftime('%H:%M')} - {to_date.strftime('%H:%M')}"
-            return f"{from_date.strftime('%d.%m.%Y %H:%M')} - {to_date.strftime('%d.%m.%Y %H:%M')}"
-        elif from_date:
-            return f"From {from_date.strftime('%d.%m.%Y %H:%M')}"
-        elif to_date:
-            return f"Until {to_date.strftime('%Y.%m.%d %H:%M')}"
+        from_time = time.localtime(self._parse_ts(valid_from)) if valid_from else None
+        to_time = time.localtime(self._parse_ts(valid_to)) if valid_to else None
+
+        if from_time and to_time:
+            if from_time[:3] == to_time[:3]:
+                return f"{time.strftime('%d.%m.%Y %H:%M', from_time)} - {time.strftime('%H:%M', to_time)}"
+            return f"{time.strftime('%d.%m.%Y %H:%M', from_time)} - {time.strftime('%d.%m.%Y %H:%M', to_time)}"
+        elif from_time:
+            return f"From {time.strftime('%d.%m.%Y %H:%M', from_time)}"
+        elif to_time:
+            return f"Until {time.strftime('%Y.%m.%d %H:%M', to_time)}"
         return "No specific time"
 
     def _truncate_title(self, title: str, max_length: int = 100) -> str:
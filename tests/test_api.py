@@ -0,0 +1,39 @@
+"""Tests for the MVG API response parsing."""
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("homeassistant")
+
+from custom_components.munich_public_transport.api import _parse_departures
+
+
+def _raw_departure(**times):
+    """Return a raw API departure with the given departure times."""
+    return {
+        "label": "U3",
+        "destination": "Moosach",
+        "transportType": "UBAHN",
+        **times,
+    }
+
+
+def test_departures_without_times_are_skipped():
+    departures = _parse_departures([
+        _raw_departure(),
+        _raw_departure(plannedDepartureTime=None, realtimeDepartureTime=None),
+        _raw_departure(plannedDepartureTime=1_700_000_000_000, realtimeDepartureTime=1_700_000_060_000),
+    ])
+
+    assert len(departures) == 1
+    assert departures[0].planned_departure == 1_700_000_000
+    assert departures[0].realtime_departure == 1_700_000_060
+
+
+def test_missing_time_falls_back_to_the_other():
+    planned_only, realtime_only = _parse_departures([
+        _raw_departure(plannedDepartureTime=1_700_000_000_000),
+        _raw_departure(realtimeDepartureTime=1_700_000_120_000),
+    ])
+
+    assert planned_only.realtime_departure == planned_only.planned_departure == 1_700_000_000
+    assert realtime_only.realtime_departure == realtime_only.planned_departure == 1_700_000_120
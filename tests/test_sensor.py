@@ -0,0 +1,70 @@
+"""Tests for the Munich Public Transport sensors."""
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("homeassistant")
+
+from custom_components.munich_public_transport.api import Departure
+from custom_components.munich_public_transport.sensor import (
+    LineSensor,
+    NextDepartureSensor,
+    _departure_rows,
+    _empty_departures,
+)
+
+
+def _departure(timestamp):
+    """Return a U3 departure at the given epoch timestamp."""
+    return Departure(
+        line="U3",
+        destination="Moosach",
+        realtime_departure=timestamp,
+        planned_departure=timestamp,
+        type="UBAHN",
+        cancelled=False,
+        messages=(),
+        platform=None,
+        platform_changed=False,
+        stop_position_number=None,
+        delay=0,
+        icon="mdi:subway-variant",
+        occupancy="LOW",
+        network="swm",
+    )
+
+
+def _data(departures):
+    """Return coordinator data for the given departures."""
+    if not departures:
+        return {**_empty_departures(), "messages": []}
+    return {
+        "all": departures,
+        "grouped": {("U3", "Moosach"): departures},
+        "next": departures[0],
+        "rows": {dep: _departure_rows(dep) for dep in departures},
+        "messages": [],
+    }
+
+
+@pytest.mark.parametrize(
+    "make_sensor",
+    [
+        lambda coordinator, entry: NextDepartureSensor(coordinator, "Marienplatz", entry),
+        lambda coordinator, entry: LineSensor(coordinator, "Marienplatz", "U3", "Moosach", entry),
+    ],
+)
+def test_sensor_is_cleared_when_departures_run_out(make_sensor):
+    coordinator = MagicMock()
+    coordinator.data = _data((_departure(int(time.time()) + 600),))
+    sensor = make_sensor(coordinator, MagicMock(entry_id="entry"))
+    sensor.async_write_ha_state = MagicMock()
+    assert sensor.native_value is not None
+
+    coordinator.data = _data(())
+    sensor._handle_coordinator_update()
+
+    assert sensor.native_value is None
+    sensor.async_write_ha_state.assert_called_once()